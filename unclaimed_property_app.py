@@ -28,6 +28,8 @@ Environment variables (see .env.example)
 DB_URL=sqlite:///data/unclaimed.db
 DATA_DIR=data
 SCO_BASE=https://dpupd.sco.ca.gov
+WEB_CONCURRENCY=4             # uvicorn worker processes (default: CPU count)
+SQLITE_CSV_EXT=/path/to/csv   # optional: SQLite's ext/misc/csv loadable extension
 
 Note: If your environment throws ModuleNotFoundError: No module named '_multiprocessing',
 comment out or remove any scheduler lines and handle DB syncs manually.
@@ -39,18 +41,28 @@ License: MIT.  Use at your own risk; not legal advice.
 from __future__ import annotations
 
 import argparse
+import contextlib
 import csv
 import io
+import itertools
 import os
 import pathlib
+import queue
+import shutil
 import sqlite3
+import threading
 import zipfile
-from typing import List, Optional
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
+import orjson
 import pandas as pd
 import requests
-from fastapi import FastAPI, HTTPException
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -63,6 +75,35 @@ TIERS = [
 ]
 DATA_DIR = pathlib.Path(os.getenv("DATA_DIR", "data"))
 DB_PATH = pathlib.Path(os.getenv("DB_PATH", DATA_DIR / "unclaimed.db"))
+# When set, shards are loaded through SQLite's CSV virtual table instead of
+# pandas, keeping the whole parse/convert/insert path in C.
+CSV_EXTENSION = os.getenv("SQLITE_CSV_EXT")
+
+def _env_workers() -> int:
+    # Read at import, which ingest shares, so a bad value must not raise here.
+    try:
+        return max(1, int(os.getenv("WEB_CONCURRENCY", "")))
+    except ValueError:
+        return os.cpu_count() or 1
+
+WEB_CONCURRENCY = _env_workers()
+
+BATCH_SIZE = 50_000
+CSV_COLUMNS = (
+    "PROPERTY_ID",
+    "OWNER_NAME",
+    "OWNER_FIRST_NAME",
+    "OWNER_ADDRESS",
+    "OWNER_CITY",
+    "OWNER_STATE",
+    "OWNER_ZIP",
+    "AMOUNT_REPORTED",
+    "CASH_REPORTED",
+    "PROPERTY_TYPE",
+    "HOLDER_NAME",
+    "HOLDER_ADDRESS",
+    "REPORTED_DATE",
+)
 
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -70,94 +111,441 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 # Ingest / Sync Pipeline
 # ---------------------------------------------------------------------------
 
-def download_zip(relative_path: str) -> bytes:
-    url = f"{BASE_URL}/{relative_path}"
-    print(f"Downloading {url} …")
-    resp = requests.get(url, timeout=60)
-    resp.raise_for_status()
-    return resp.content
+def http_session() -> requests.Session:
+    """Session whose connection pool can serve every tier download at once."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=len(TIERS))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def tier_url(relative_path: str) -> str:
+    return f"{BASE_URL}/{relative_path}"
 
-def extract_csv_from_zip(zip_bytes: bytes) -> io.StringIO:
-    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+def load_sync_state() -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """(ETag, Last-Modified) recorded per archive URL at the last successful sync."""
+    if not DB_PATH.exists():
+        return {}
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        rows = conn.execute("SELECT url, etag, last_modified FROM sync_state").fetchall()
+    except sqlite3.OperationalError:  # DB predates sync_state
+        return {}
+    finally:
+        conn.close()
+    return {url: (etag, last_modified) for url, etag, last_modified in rows}
+
+def save_sync_state(entries: Iterable[Tuple[str, Optional[str], Optional[str]]]):
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        with conn:
+            conn.executemany(
+                """INSERT INTO sync_state(url, etag, last_modified) VALUES (?,?,?)
+                   ON CONFLICT(url) DO UPDATE SET etag=excluded.etag, last_modified=excluded.last_modified;""",
+                entries,
+            )
+    finally:
+        conn.close()
+
+def download_zip(
+    relative_path: str,
+    session: Optional[requests.Session] = None,
+    validators: Optional[Tuple[Optional[str], Optional[str]]] = None,
+) -> Optional[Tuple[pathlib.Path, Optional[str], Optional[str]]]:
+    """Fetch an archive into DATA_DIR, returning ``(path, etag, last_modified)``.
+
+    *validators* are the stored ``(etag, last_modified)`` for the URL; if the
+    server answers 304 Not Modified, nothing is downloaded and None is
+    returned. A ``.part`` file left by an interrupted download is resumed with
+    a Range request guarded by If-Range.
+    """
+    url = tier_url(relative_path)
+    http = session or requests
+    dest = DATA_DIR / pathlib.Path(relative_path).name
+    tmp = dest.with_name(dest.name + ".part")
+    tmp_validator = dest.with_name(dest.name + ".part.validator")
+
+    headers = {}
+    etag, last_modified = validators or (None, None)
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    offset = tmp.stat().st_size if tmp.exists() and tmp_validator.exists() else 0
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = tmp_validator.read_text()
+
+    print(f"Downloading {url} …" if not offset else f"Resuming {url} at byte {offset} …")
+    # Stream to disk so ZipFile can seek without holding the archive in RAM.
+    with http.get(url, headers=headers, timeout=60, stream=True) as resp:
+        if resp.status_code == 304:
+            print(f"{url} not modified – skipping")
+            return None
+        if resp.status_code == 416:
+            # Stale or already-complete partial; start over.
+            tmp.unlink(missing_ok=True)
+            tmp_validator.unlink(missing_ok=True)
+            return download_zip(relative_path, session, validators)
+        resp.raise_for_status()
+        new_etag = resp.headers.get("ETag")
+        new_last_modified = resp.headers.get("Last-Modified")
+        resuming = resp.status_code == 206
+        if not resuming:
+            validator = new_etag or new_last_modified
+            if validator:
+                tmp_validator.write_text(validator)
+            else:
+                tmp_validator.unlink(missing_ok=True)
+        resp.raw.decode_content = True
+        with open(tmp, "ab" if resuming else "wb") as f:
+            shutil.copyfileobj(resp.raw, f, 1 << 20)
+    os.replace(tmp, dest)
+    tmp_validator.unlink(missing_ok=True)
+    return dest, new_etag, new_last_modified
+
+@contextlib.contextmanager
+def extract_csv_from_zip(zip_path: pathlib.Path) -> Iterator[TextIO]:
+    """Yield the archive's first member as a decoded text stream."""
+    with zipfile.ZipFile(zip_path) as zf:
         name = zf.namelist()[0]
-        with zf.open(name) as f:
-            buf = f.read()
-    return io.StringIO(buf.decode("utf-8", errors="replace"))
+        with zf.open(name) as raw:
+            yield io.TextIOWrapper(raw, encoding="utf-8-sig", errors="replace", newline="")
+
+# Columns written at ingest, in _chunk_rows order.
+PROPERTY_FIELDS = (
+    "property_id, owner_last, owner_first, owner_address, owner_city, owner_state, owner_zip, "
+    "amount_reported, cash_reported, property_type, holder_name, holder_address, "
+    "reported_date"
+)
+
+def _column_index(header: List[str]) -> dict:
+    """Map each CSV column we ingest to its position in *header*.
 
-def build_database(csv_buffers: List[io.StringIO]):
+    Only PROPERTY_ID is required; any other column the file lacks maps to
+    None and is loaded as an empty value.
+    """
+    header = [h.lstrip("\ufeff").strip() for h in header]
+    idx = {}
+    for name in CSV_COLUMNS:
+        aliases = (name, "Property ID") if name == "PROPERTY_ID" else (name,)
+        idx[name] = next((header.index(a) for a in aliases if a in header), None)
+    if idx["PROPERTY_ID"] is None:
+        raise ValueError("CSV header has no PROPERTY_ID column")
+    return idx
+
+def _chunk_rows(chunk: pd.DataFrame) -> Iterator[tuple]:
+    """Convert a parsed CSV chunk into ``properties`` insert tuples column-wise."""
+    idx = _column_index(list(chunk.columns))
+    empty = pd.Series("", index=chunk.index, dtype=object)
+    col = {name: empty if i is None else chunk.iloc[:, i] for name, i in idx.items()}
+    amount = pd.to_numeric(col["AMOUNT_REPORTED"], errors="coerce").fillna(0.0)
+    cash = pd.to_numeric(col["CASH_REPORTED"], errors="coerce").astype(object)
+    cash = cash.where(cash.notna(), None)
+    # 5-digit ZIPs are stored as integers (re-padded on read, see
+    # PROPERTY_COLUMNS); anything else stays text. owner_zip is declared
+    # without a type so SQLite applies no affinity to those text values.
+    zips = col["OWNER_ZIP"].str.strip()
+    owner_zip = [int(z) if len(z) == 5 and z.isdigit() else (z or None) for z in zips]
+    columns = [
+        col["PROPERTY_ID"],
+        col["OWNER_NAME"],
+        col["OWNER_FIRST_NAME"],
+        col["OWNER_ADDRESS"],
+        col["OWNER_CITY"],
+        col["OWNER_STATE"],
+        owner_zip,
+        amount,
+        cash,
+        col["PROPERTY_TYPE"],
+        col["HOLDER_NAME"],
+        col["HOLDER_ADDRESS"],
+        col["REPORTED_DATE"],
+    ]
+    return zip(*(c if isinstance(c, list) else c.tolist() for c in columns))
+
+def _insert_csv(cur: sqlite3.Cursor, stream: TextIO):
+    try:
+        chunks = pd.read_csv(
+            stream,
+            dtype=str,
+            keep_default_na=False,
+            chunksize=BATCH_SIZE,
+            on_bad_lines="warn",
+        )
+    except pd.errors.EmptyDataError:
+        return
+    # One executemany per file, fed lazily chunk by chunk: sqlite3 binds from
+    # the iterator directly, so only the current chunk is held.
+    with chunks:
+        cur.executemany(
+            f"INSERT INTO properties ({PROPERTY_FIELDS}) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)",
+            itertools.chain.from_iterable(_chunk_rows(c.fillna("")) for c in chunks),
+        )
+
+def _load_csv_extension(conn: sqlite3.Connection) -> bool:
+    if not CSV_EXTENSION:
+        return False
+    try:
+        conn.enable_load_extension(True)
+        try:
+            conn.load_extension(CSV_EXTENSION)
+        finally:
+            conn.enable_load_extension(False)
+    except (AttributeError, sqlite3.OperationalError) as exc:
+        # AttributeError: this Python's sqlite3 was built without extension support.
+        print(f"[warn] CSV extension unavailable ({exc}); parsing with pandas")
+        return False
+    return True
+
+def _vtab_select_sql(idx: dict) -> str:
+    """SQL equivalent of _chunk_rows over ``temp.csv_in(c0, c1, …)``.
+
+    Amounts are inserted as trimmed text: the shard's REAL affinity converts
+    only well-formed numbers, like ``pd.to_numeric``, and _insert_csv_vtab
+    then resets whatever stayed text.
+    """
+    c = {name: "''" if i is None else f"coalesce(c{i}, '')" for name, i in idx.items()}
+    zip_ = f"trim({c['OWNER_ZIP']})"
+    return (
+        f"SELECT {c['PROPERTY_ID']}, {c['OWNER_NAME']}, {c['OWNER_FIRST_NAME']}, "
+        f"{c['OWNER_ADDRESS']}, {c['OWNER_CITY']}, {c['OWNER_STATE']}, "
+        f"CASE WHEN length({zip_}) = 5 AND {zip_} NOT GLOB '*[^0-9]*' "
+        f"THEN CAST({zip_} AS INTEGER) ELSE NULLIF({zip_}, '') END, "
+        f"trim({c['AMOUNT_REPORTED']}), trim({c['CASH_REPORTED']}), "
+        f"{c['PROPERTY_TYPE']}, {c['HOLDER_NAME']}, {c['HOLDER_ADDRESS']}, {c['REPORTED_DATE']} "
+        "FROM temp.csv_in"
+    )
+
+def _insert_csv_vtab(cur: sqlite3.Cursor, zip_path: pathlib.Path):
+    # The CSV virtual table reads from a plain file, so unpack the member
+    # beside the archive for the duration of the load. It copies bytes into
+    # TEXT columns unchecked, so re-encode on the way out (same
+    # errors="replace" decoding as the pandas path) to keep every stored
+    # string valid UTF-8.
+    csv_path = zip_path.with_suffix(".csv")
+    with extract_csv_from_zip(zip_path) as src, open(csv_path, "w", encoding="utf-8", newline="") as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    try:
+        with open(csv_path, encoding="utf-8", errors="replace", newline="") as f:
+            header = next(csv.reader(f), None)
+        if header is None:
+            return
+        idx = _column_index(header)
+        # Positional column names via schema=, so header spelling doesn't matter;
+        # header=YES still skips the first row. Virtual-table arguments cannot be
+        # bound, hence the quoting.
+        schema = "CREATE TABLE x({})".format(", ".join(f"c{i}" for i in range(len(header))))
+        filename = str(csv_path).replace("'", "''")
+        print(f"Loading {csv_path.name} via CSV virtual table …")
+        cur.execute(
+            f"CREATE VIRTUAL TABLE temp.csv_in USING csv(filename='{filename}', header=YES, schema='{schema}')"
+        )
+        try:
+            cur.execute(f"INSERT INTO properties ({PROPERTY_FIELDS}) {_vtab_select_sql(idx)}")
+        finally:
+            cur.execute("DROP TABLE temp.csv_in")
+        cur.execute("UPDATE properties SET amount_reported = 0.0 WHERE typeof(amount_reported) = 'text'")
+        cur.execute("UPDATE properties SET cash_reported = NULL WHERE typeof(cash_reported) = 'text'")
+    finally:
+        csv_path.unlink(missing_ok=True)
+
+def build_shard(zip_path: pathlib.Path) -> pathlib.Path:
+    """Load one archive into its own scratch DB next to it; runs in a worker process.
+
+    The shard has no primary key or FTS and is written without a journal: it
+    only lives until build_database merges it, and is rebuilt from the ZIP if
+    anything goes wrong.
+    """
+    shard = zip_path.with_suffix(".db")
+    shard.unlink(missing_ok=True)
+    conn = sqlite3.connect(shard)
+    cur = conn.cursor()
+    cur.execute("PRAGMA page_size=65536;")
+    cur.execute("PRAGMA journal_mode=OFF;")
+    cur.execute("PRAGMA synchronous=OFF;")
+    cur.execute("PRAGMA cache_size=-262144;")
+    cur.execute(
+        """CREATE TABLE properties (
+                property_id TEXT,
+                owner_last TEXT,
+                owner_first TEXT,
+                owner_address TEXT,
+                owner_city TEXT,
+                owner_state TEXT,
+                owner_zip,
+                amount_reported REAL,
+                cash_reported REAL,
+                property_type TEXT,
+                holder_name TEXT,
+                holder_address TEXT,
+                reported_date TEXT
+            );"""
+    )
+    try:
+        if _load_csv_extension(conn):
+            _insert_csv_vtab(cur, zip_path)
+        else:
+            with extract_csv_from_zip(zip_path) as stream:
+                print(f"Streaming {zip_path.name} → {shard.name} …")
+                _insert_csv(cur, stream)
+        conn.commit()
+    finally:
+        conn.close()
+    return shard
+
+def _shard_executor() -> Executor:
+    # Some slim/containerised Pythons lack _multiprocessing; fall back to
+    # threads there (pandas' parser still releases the GIL for much of the work).
+    # Workers are spawned, not forked: the download threads are already
+    # running, and forking a threaded process can deadlock the child.
+    try:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(
+            max_workers=len(TIERS), mp_context=multiprocessing.get_context("spawn")
+        )
+    except (ImportError, NotImplementedError, OSError):
+        return ThreadPoolExecutor(max_workers=len(TIERS))
+
+def build_database(shards: List[pathlib.Path]):
+    """Merge per-archive shards into DB_PATH and rebuild the FTS index."""
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
+    # page_size only takes effect on a fresh DB, before WAL is enabled and
+    # before the first table is created.
+    cur.execute("PRAGMA page_size=65536;")
     cur.execute("PRAGMA journal_mode=WAL;")
+    cur.execute("PRAGMA synchronous=NORMAL;")
+    cur.execute("PRAGMA temp_store=MEMORY;")
+    cur.execute("PRAGMA cache_size=-262144;")
+    cur.execute("PRAGMA mmap_size=30000000000;")
     cur.execute(
         """CREATE TABLE IF NOT EXISTS properties (
                 property_id TEXT PRIMARY KEY,
-                owner_name TEXT,
+                owner_last TEXT,
+                owner_first TEXT,
+                owner_name TEXT GENERATED ALWAYS AS (trim(owner_last || ' ' || owner_first)) VIRTUAL,
                 owner_address TEXT,
                 owner_city TEXT,
                 owner_state TEXT,
-                owner_zip TEXT,
+                owner_zip,
                 amount_reported REAL,
-                cash_reported TEXT,
+                cash_reported REAL,
                 property_type TEXT,
                 holder_name TEXT,
                 holder_address TEXT,
-                reported_date TEXT,
-                raw_json TEXT
+                reported_date TEXT
             );"""
     )
     cur.execute(
         """CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5(
-                owner_name, owner_address, owner_city, holder_name, content='properties', content_rowid='rowid');"""
+                owner_name, owner_address, owner_city, holder_name, content='properties', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2');"""
+    )
+    cur.execute(
+        """CREATE TABLE IF NOT EXISTS sync_state (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT
+            );"""
     )
     conn.commit()
 
-    for buf in csv_buffers:
-        print("Streaming rows → DB …")
-        reader = csv.DictReader(buf)
-        rows = []
-        for i, row in enumerate(reader, 1):
-            rows.append(
-                (
-                    row.get("PROPERTY_ID") or row.get("Property ID"),
-                    f"{row.get('OWNER_NAME', '')} {row.get('OWNER_FIRST_NAME', '')}",
-                    row.get("OWNER_ADDRESS", ""),
-                    row.get("OWNER_CITY", ""),
-                    row.get("OWNER_STATE", ""),
-                    row.get("OWNER_ZIP", ""),
-                    float(row.get("AMOUNT_REPORTED", 0) or 0),
-                    row.get("CASH_REPORTED", ""),
-                    row.get("PROPERTY_TYPE", ""),
-                    row.get("HOLDER_NAME", ""),
-                    row.get("HOLDER_ADDRESS", ""),
-                    row.get("REPORTED_DATE", ""),
-                    str(row),
-                )
+    target = source = PROPERTY_FIELDS
+    columns = {r[1]: r[2].upper() for r in cur.execute("PRAGMA main.table_xinfo(properties)")}
+    if "owner_last" not in columns:
+        # DB created before owner_name became a generated column.
+        target = target.replace("owner_last, owner_first", "owner_name")
+        source = source.replace("owner_last, owner_first", "trim(owner_last || ' ' || owner_first)")
+    if columns.get("owner_zip") == "TEXT":
+        # DB created before owner_zip stored integers: TEXT affinity would
+        # keep an integer's digits but drop its leading zeros, so write text.
+        source = source.replace(
+            "owner_zip", "CASE WHEN typeof(owner_zip) = 'integer' THEN printf('%05d', owner_zip) ELSE owner_zip END"
+        )
+
+    # ATTACH is not allowed inside a transaction, so attach every shard first.
+    schemas = [f"shard{i}" for i in range(len(shards))]
+    for shard, schema in zip(shards, schemas):
+        cur.execute(f"ATTACH DATABASE ? AS {schema}", (str(shard),))
+
+    # One transaction for the whole merge: a single fsync at COMMIT, and the
+    # FTS index is committed together with the rows it covers.
+    cur.execute("BEGIN IMMEDIATE")
+    changes = conn.total_changes
+    try:
+        for schema in schemas:
+            print(f"Merging {schema} → DB …")
+            cur.execute(
+                f"INSERT OR IGNORE INTO main.properties ({target}) "
+                f"SELECT {source} FROM {schema}.properties;"
             )
-            if i % 10000 == 0:
-                cur.executemany("INSERT OR IGNORE INTO properties VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", rows)
-                conn.commit()
-                cur.executemany("INSERT INTO properties_fts(rowid, owner_name, owner_address, owner_city, holder_name) SELECT rowid, owner_name, owner_address, owner_city, holder_name FROM properties WHERE rowid > (SELECT IFNULL(MAX(rowid),0) FROM properties_fts);")
-                rows = []
-        if rows:
-            cur.executemany("INSERT OR IGNORE INTO properties VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", rows)
-            conn.commit()
-            cur.executemany("INSERT INTO properties_fts(rowid, owner_name, owner_address, owner_city, holder_name) SELECT rowid, owner_name, owner_address, owner_city, holder_name FROM properties WHERE rowid > (SELECT IFNULL(MAX(rowid),0) FROM properties_fts);")
-            conn.commit()
-    conn.close()
+        # Index everything in one sequential pass over the content table rather
+        # than incrementally per batch.
+        if conn.total_changes != changes:
+            print("Rebuilding full-text index …")
+            cur.execute("INSERT INTO properties_fts(properties_fts) VALUES('rebuild');")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    for shard in shards:
+        shard.unlink(missing_ok=True)
 
 def sync():
-    csv_buffers = []
-    for fname in TIERS:
-        zip_bytes = download_zip(fname)
-        buf = extract_csv_from_zip(zip_bytes)
-        csv_buffers.append(buf)
-    build_database(csv_buffers)
+    state = load_sync_state()
+    fetched = []
+    shard_futs = {}
+
+    # Downloads run concurrently, and each archive is handed to its own worker
+    # process as soon as it lands, so tiers are parsed and written in parallel.
+    # The calling process then merges the shards as the single writer of
+    # DB_PATH, always in TIERS order so INSERT OR IGNORE keeps the same row
+    # for a duplicate PROPERTY_ID whichever download finished first.
+    with http_session() as session, \
+            ThreadPoolExecutor(max_workers=len(TIERS)) as ex, \
+            _shard_executor() as workers:
+        futs = {
+            ex.submit(download_zip, fname, session, state.get(tier_url(fname))): fname
+            for fname in TIERS
+        }
+        try:
+            for fut in as_completed(futs):
+                result = fut.result()
+                if result is None:
+                    continue
+                fname = futs[fut]
+                path, etag, last_modified = result
+                fetched.append((tier_url(fname), etag, last_modified))
+                shard_futs[fname] = workers.submit(build_shard, path)
+            shards = [shard_futs[f].result() for f in TIERS if f in shard_futs]
+        except BaseException:
+            for f in [*futs, *shard_futs.values()]:
+                f.cancel()
+            raise
+    if not fetched:
+        print("[sync] Upstream unchanged – nothing to ingest")
+        return
+    build_database(shards)
+    # Only record validators once their data is committed, so a failed ingest
+    # is retried in full next time.
+    save_sync_state(fetched)
     print("[sync] Complete – DB ready →", DB_PATH)
 
 # ---------------------------------------------------------------------------
 # FastAPI Service
 # ---------------------------------------------------------------------------
-app = FastAPI(title="CA Unclaimed Property Search API", version="0.4")
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Each uvicorn worker process opens its own read pool before taking traffic.
+    if DB_PATH.exists():
+        _get_pool()
+    yield
+
+app = FastAPI(title="CA Unclaimed Property Search API", version="0.4", lifespan=lifespan)
 
 class Property(BaseModel):
     property_id: str
@@ -171,30 +559,159 @@ class Property(BaseModel):
     holder_name: Optional[str] = None
     reported_date: Optional[str] = None
 
-def get_conn():
-    return sqlite3.connect(DB_PATH)
+# Exactly the Property fields, so rows feed the model (or the JSON stream)
+# without decoding columns the API never returns. Integer ZIPs lose their
+# leading zeros on disk; restore them here.
+PROPERTY_COLUMNS = (
+    "p.property_id, p.owner_name, p.owner_address, p.owner_city, p.owner_state, "
+    "CASE WHEN typeof(p.owner_zip) = 'integer' THEN printf('%05d', p.owner_zip) "
+    "ELSE p.owner_zip END AS owner_zip, p.amount_reported, "
+    "p.property_type, p.holder_name, p.reported_date"
+)
+SEARCH_SQL = (
+    f"SELECT {PROPERTY_COLUMNS} FROM properties_fts fts JOIN properties p ON p.rowid = fts.rowid "
+    "WHERE properties_fts MATCH ? ORDER BY bm25(properties_fts) LIMIT ?"
+)
+PROPERTY_SQL = f"SELECT {PROPERTY_COLUMNS} FROM properties p WHERE p.property_id = ?"
+
+def fts_query(q: str) -> str:
+    """Quote each word of *q* as an FTS5 prefix term so punctuation is inert."""
+    return " ".join('"{}"*'.format(tok.replace('"', '""')) for tok in q.split())
+
+# Larger result sets are streamed as JSON instead of built as a list.
+STREAM_THRESHOLD = 1000
+STREAM_CHUNK = 500
+MAX_LIMIT = 100_000  # sqlite binds LIMIT as a 64-bit int; cap well inside it
+
+# Popular queries repeat; serve them from already-encoded JSON. Ingest runs in
+# another process, so the TTL is what bounds staleness after a sync. Sized in
+# bytes of encoded body per worker. TTLCache is not thread-safe on its own and
+# endpoints run in the threadpool.
+SEARCH_CACHE_BYTES = 64 << 20
+_search_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_BYTES, ttl=300, getsizeof=len)
+_search_cache_lock = threading.Lock()
+
+# Per worker process: split roughly 2 connections per CPU across the uvicorn
+# workers so the host total doesn't grow with the worker count.
+POOL_SIZE = max(4, min(32, (os.cpu_count() or 1) * 2 // WEB_CONCURRENCY))
+POOL_TIMEOUT = 5.0  # seconds to wait for a free connection before a 503
+# Streams hold their own connection for the whole response, so cap how many
+# run at once per worker rather than letting each request open another.
+_stream_slots = threading.BoundedSemaphore(POOL_SIZE)
+_pool: Optional[queue.Queue] = None
+_pool_lock = threading.Lock()
+
+def _connect_reader() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        f"{DB_PATH.resolve().as_uri()}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        cached_statements=256,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only=1;")
+    # Small private cache: pages are served from the shared mmap window, which
+    # all connections and workers share through the OS page cache.
+    conn.execute("PRAGMA cache_size=-8192;")
+    conn.execute(f"PRAGMA mmap_size={1 << 31};")
+    return conn
+
+def _open_reader() -> sqlite3.Connection:
+    conn = _connect_reader()
+    # Compile the hot queries into the statement cache up front so the first
+    # request on each pooled connection doesn't pay for it.
+    conn.execute(SEARCH_SQL, (fts_query("warmup"), 0)).close()
+    conn.execute(PROPERTY_SQL, ("",)).close()
+    return conn
+
+def _get_pool() -> queue.Queue:
+    # Opened lazily: `serve` may still be building the DB when this module is
+    # imported, and mode=ro refuses to create a missing file.
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = queue.Queue(maxsize=POOL_SIZE)
+                for _ in range(POOL_SIZE):
+                    pool.put(_open_reader())
+                _pool = pool
+    return _pool
+
+@contextlib.contextmanager
+def borrow_conn() -> Iterator[sqlite3.Connection]:
+    """Lend a pooled read-only connection; 503 if none frees up in time.
+
+    Borrow inside the endpoint body, never from a dependency: the borrow and
+    the return must happen on the same threadpool thread, or a burst of
+    waiting borrowers can starve the holders of a thread to finish on.
+    """
+    pool = _get_pool()
+    try:
+        conn = pool.get(timeout=POOL_TIMEOUT)
+    except queue.Empty:
+        raise HTTPException(status_code=503, detail="Database busy, retry shortly")
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
 
-@app.get("/search", response_model=List[Property])
-def search(q: str, limit: int = 50):
-    if len(q) < 2:
+def _stream_search(match: str, limit: int) -> Iterator[bytes]:
+    # Uses a dedicated connection rather than a pooled one: Starlette runs
+    # each next() on whichever threadpool thread is free, so holding a pool
+    # slot across yields can deadlock against requests waiting in borrow_conn.
+    # The caller has already taken a _stream_slots permit; it is released
+    # here once the stream finishes or is closed.
+    try:
+        with contextlib.closing(_connect_reader()) as conn:
+            cur = conn.execute(SEARCH_SQL, (match, limit))
+            yield b"["
+            sep = b""
+            while True:
+                rows = cur.fetchmany(STREAM_CHUNK)
+                if not rows:
+                    break
+                yield sep + b",".join(orjson.dumps(dict(r)) for r in rows)
+                sep = b","
+            yield b"]"
+    finally:
+        _stream_slots.release()
+
+# Rows are returned as pre-encoded JSON, so there is no response_model to
+# validate against; the schema is still published for the docs.
+@app.get("/search", response_model=None, responses={200: {"model": List[Property]}})
+def search(q: str, limit: int = Query(50, ge=1, le=MAX_LIMIT)) -> Response:
+    match = fts_query(q)
+    if len(q.strip()) < 2 or not match:
         raise HTTPException(status_code=400, detail="Query too short")
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT p.* FROM properties p JOIN properties_fts fts ON p.rowid = fts.rowid WHERE fts MATCH ? LIMIT ?", (q, limit))
-    rows = [dict(zip([c[0] for c in cur.description], r)) for r in cur.fetchall()]
-    conn.close()
-    return rows
+    if limit > STREAM_THRESHOLD:
+        if not _stream_slots.acquire(timeout=POOL_TIMEOUT):
+            raise HTTPException(status_code=503, detail="Database busy, retry shortly")
+        stream = _stream_search(match, limit)
+        # Run it up to the first chunk here: that surfaces query errors before
+        # the headers go out, and a started generator's finally (which frees
+        # the permit) still runs if the client leaves before reading the body.
+        head = next(stream)
+        return StreamingResponse(itertools.chain((head,), stream), media_type="application/json")
+    key = (match.lower(), limit)
+    with _search_cache_lock:
+        body = _search_cache.get(key)
+    if body is None:
+        with borrow_conn() as conn:
+            rows = conn.execute(SEARCH_SQL, (match, limit)).fetchall()
+        # Rows come straight from our own schema, so skip re-validating them.
+        body = orjson.dumps([dict(r) for r in rows])
+        if len(body) <= SEARCH_CACHE_BYTES:
+            with _search_cache_lock:
+                _search_cache[key] = body
+    return Response(body, media_type="application/json")
 
 @app.get("/property/{property_id}", response_model=Property)
 def get_property(property_id: str):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM properties WHERE property_id = ?", (property_id,))
-    row = cur.fetchone()
-    conn.close()
+    with borrow_conn() as conn:
+        row = conn.execute(PROPERTY_SQL, (property_id,)).fetchone()
     if not row:
         raise HTTPException(404, "Not found")
-    return dict(zip([c[0] for c in cur.description], row))
+    return Property.model_construct(**row)
 
 class ClaimRequest(BaseModel):
     property_id: str
@@ -224,7 +741,18 @@ def main():
         if not DB_PATH.exists():
             print("[warn] DB not found → building automatically …")
             sync()
-        run("unclaimed_property_app:app", host="0.0.0.0", port=8000, reload=False, workers=1)
+        # The API is read-only, so workers scale out freely over the WAL-mode
+        # DB; any ingest above has finished before they start. "auto" picks
+        # uvloop and httptools from uvicorn[standard] where the platform has them.
+        run(
+            "unclaimed_property_app:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=False,
+            workers=WEB_CONCURRENCY,
+            loop="auto",
+            http="auto",
+        )
 
 if __name__ == "__main__":
     main()